@@ -1,9 +1,18 @@
 import pandas as pd
+import numpy as np
 import json
 from pathlib import Path
+from scipy import sparse
+
+import archive
+import store
+import users
 
 CURATED_DIR = Path("data/curated")
 
+SESSION_GAP_MIN = 30      # a pause longer than this starts a new listening session
+TOP_NEIGHBORS = 10
+
 
 # -----------------------------
 # Load curated data
@@ -107,6 +116,167 @@ def artist_frequency(tracks_df):
     return counts
 
 
+# -----------------------------
+# Rank movement across archived top-list snapshots
+# -----------------------------
+def rank_movement():
+    print("\n▶ Computing rank movement across snapshots...")
+
+    rows = []
+    for kind in ["tracks", "artists"]:
+        for range_name in ["short_term", "medium_term", "long_term"]:
+            # Snapshots are numbered by manifest order; fetched_at only has
+            # second precision, so two fetches can share a timestamp
+            snapshots = archive.distinct_snapshots(f"top_{kind}_{range_name}")
+            for number, entry in enumerate(snapshots, start=1):
+                items = archive.load_object(entry["sha256"])["items"]
+                rows.append(pd.DataFrame({
+                    "kind": kind[:-1],
+                    "time_range": range_name,
+                    "snapshot": number,
+                    "fetched_at": entry["fetched_at"],
+                    "id": [i["id"] for i in items],
+                    "name": [i["name"] for i in items],
+                    "rank": range(1, len(items) + 1),
+                }))
+
+    if not rows:
+        print("No archived snapshots yet — run fetch_data.py first.")
+        return pd.DataFrame()
+
+    ranks = pd.concat(rows, ignore_index=True)
+    keys = ["kind", "time_range"]
+
+    # Each snapshot is joined to its predecessor (snapshot - 1)
+    previous = ranks[keys + ["snapshot", "id", "name", "rank"]].assign(snapshot=ranks["snapshot"] + 1)
+
+    moves = ranks.drop(columns="fetched_at").merge(
+        previous, on=keys + ["snapshot", "id"], how="outer", suffixes=("", "_prev")
+    )
+
+    # Drop the shifted copy of the latest snapshot and the first (no predecessor)
+    snapshot_times = ranks[keys + ["snapshot", "fetched_at"]].drop_duplicates()
+    moves = moves.merge(snapshot_times, on=keys + ["snapshot"], how="inner")
+    moves = moves[moves["snapshot"] > 1]
+
+    moves = moves.rename(columns={"rank_prev": "prev_rank"})
+    moves["name"] = moves["name"].fillna(moves["name_prev"])
+    moves["movement"] = moves["prev_rank"] - moves["rank"]
+
+    moves["status"] = "steady"
+    moves.loc[moves["movement"] > 0, "status"] = "climber"
+    moves.loc[moves["movement"] < 0, "status"] = "faller"
+    moves.loc[moves["prev_rank"].isna(), "status"] = "new entry"
+    moves.loc[moves["rank"].isna(), "status"] = "dropped out"
+
+    moves = moves[keys + ["snapshot", "fetched_at", "id", "name", "rank", "prev_rank", "movement", "status"]]
+    moves = moves.sort_values(keys + ["snapshot", "rank"]).reset_index(drop=True)
+
+    moves.to_csv(CURATED_DIR / "rank_movement.csv", index=False)
+
+    print("✔ Saved: data/curated/rank_movement.csv")
+    return moves
+
+
+# -----------------------------
+# Artist graphs (sparse artist x artist matrices)
+# -----------------------------
+def cooccurrence(groups, artist_codes, n_artists):
+    # groups x artists incidence (binary), then A.T @ A counts shared groups
+    incidence = sparse.csr_matrix(
+        (np.ones(len(groups), dtype=np.int32), (groups, artist_codes)),
+        shape=(groups.max() + 1, n_artists),
+    )
+    incidence.data[:] = 1
+    co = (incidence.T @ incidence).tocsr()
+    co.setdiag(0)
+    co.eliminate_zeros()
+    return co
+
+
+def top_neighbors(matrix, artist_index, relation, k=TOP_NEIGHBORS):
+    coo = matrix.tocoo()
+    edges = pd.DataFrame({"row": coo.row, "col": coo.col, "weight": coo.data})
+    edges = (
+        edges.sort_values(["row", "weight"], ascending=[True, False])
+        .groupby("row")
+        .head(k)
+    )
+    return pd.DataFrame({
+        "relation": relation,
+        "artist_id": artist_index[edges["row"].to_numpy()],
+        "neighbor_id": artist_index[edges["col"].to_numpy()],
+        "weight": edges["weight"].to_numpy(),
+    })
+
+
+def artist_graph(db_path=store.DB_PATH):
+    print("\n▶ Computing artist collaboration + co-listening graphs...")
+
+    conn = store.connect(db_path)
+    try:
+        plays = pd.read_sql_query("SELECT played_at, track_id, artist_ids FROM plays", conn)
+        top = pd.read_sql_query("SELECT track_id, artist_ids FROM top_tracks", conn)
+        names = pd.read_sql_query("SELECT artist_id, name FROM artists", conn)
+    finally:
+        conn.close()
+
+    # One row per (play, credited artist), every artist — not just the first
+    credits = (
+        plays.assign(artist_id=plays["artist_ids"].str.split(","))
+        .explode("artist_id")
+    )
+    top_credits = (
+        top.assign(artist_id=top["artist_ids"].str.split(","))
+        .explode("artist_id")
+    )
+    credits = credits[credits["artist_id"].fillna("") != ""]
+    top_credits = top_credits[top_credits["artist_id"].fillna("") != ""]
+
+    if credits.empty and top_credits.empty:
+        print("No tracks stored yet — skipping artist graphs.")
+        return pd.DataFrame()
+
+    artist_codes, artist_index = pd.factorize(
+        pd.concat([credits["artist_id"], top_credits["artist_id"]], ignore_index=True)
+    )
+    artist_index = np.asarray(artist_index)
+    n_artists = len(artist_index)
+    play_codes = artist_codes[:len(credits)]
+    top_codes = artist_codes[len(credits):]
+
+    # Co-credit: artists sharing a track
+    track_codes, _ = pd.factorize(
+        pd.concat([credits["track_id"], top_credits["track_id"]], ignore_index=True)
+    )
+    co_credit = cooccurrence(track_codes, np.concatenate([play_codes, top_codes]), n_artists)
+    neighbors = [top_neighbors(co_credit, artist_index, "co_credit")]
+
+    # Co-listening: artists played in the same session
+    if not credits.empty:
+        # naive UTC datetime64 — a tz-aware column would give an object array of Timestamps
+        played_at = pd.to_datetime(plays["played_at"], utc=True).dt.tz_convert(None).to_numpy()
+        order = np.argsort(played_at, kind="stable")
+        gaps = np.diff(played_at[order]) > np.timedelta64(SESSION_GAP_MIN, "m")
+        session = np.empty(len(plays), dtype=np.int64)
+        session[order] = np.concatenate([[0], np.cumsum(gaps)])
+
+        # credits.index still points at the play row each credit came from
+        co_listen = cooccurrence(session[credits.index.to_numpy()], play_codes, n_artists)
+        neighbors.append(top_neighbors(co_listen, artist_index, "co_listen"))
+
+    neighbors = pd.concat(neighbors, ignore_index=True)
+    name_map = names.drop_duplicates("artist_id").set_index("artist_id")["name"]
+    neighbors["artist"] = neighbors["artist_id"].map(name_map)
+    neighbors["neighbor"] = neighbors["neighbor_id"].map(name_map)
+    neighbors = neighbors[["relation", "artist_id", "artist", "neighbor_id", "neighbor", "weight"]]
+
+    neighbors.to_csv(CURATED_DIR / "artist_neighbors.csv", index=False)
+
+    print(f"✔ Saved: data/curated/artist_neighbors.csv ({n_artists} artists)")
+    return neighbors
+
+
 # -----------------------------
 # MAIN
 # -----------------------------
@@ -115,6 +285,9 @@ if __name__ == "__main__":
     print("      Analysis Pipeline")
     print("==============================\n")
 
+    # --user <name>: read and write data/users/<name>/data/
+    users.enter_user_dir()
+
     tracks, artists, recently = load_curated()
 
     genre_summary(artists)
@@ -122,5 +295,7 @@ if __name__ == "__main__":
     listening_daily(recently)
     duration_stats(tracks)
     artist_frequency(tracks)
+    rank_movement()
+    artist_graph()
 
     print("\n🎉 Analysis complete! Charts/data ready for visualization.")
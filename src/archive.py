@@ -0,0 +1,84 @@
+import gzip
+import json
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+RAW_DIR = Path("data/raw")
+OBJECTS_DIR = RAW_DIR / "objects"
+MANIFEST = RAW_DIR / "snapshots.jsonl"
+
+
+# -------------------------------
+# Helper: canonical bytes + content hash
+# -------------------------------
+def encode(data):
+    # Compact, key-sorted JSON so identical payloads hash identically
+    return json.dumps(data, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def object_path(digest):
+    return OBJECTS_DIR / digest[:2] / f"{digest}.json.gz"
+
+
+# -------------------------------
+# Write: store one fetch as a snapshot
+# -------------------------------
+def store_snapshot(data, name, fetched_at=None):
+    payload = encode(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    path = object_path(digest)
+
+    # Identical payloads share one object — only the manifest line is new
+    is_new = not path.exists()
+    if is_new:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+        tmp.replace(path)
+
+    entry = {
+        "name": name,
+        "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sha256": digest,
+        "bytes": len(payload),
+    }
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    return digest, is_new
+
+
+# -------------------------------
+# Read: manifest + objects
+# -------------------------------
+def load_object(digest):
+    return json.loads(gzip.decompress(object_path(digest).read_bytes()))
+
+
+def snapshots(name=None):
+    if not MANIFEST.exists():
+        return []
+
+    with open(MANIFEST, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    return [e for e in entries if name is None or e["name"] == name]
+
+
+def distinct_snapshots(name):
+    # Drop repeated fetches whose content did not change since the previous one
+    entries, last = [], None
+    for e in snapshots(name):
+        if e["sha256"] != last:
+            entries.append(e)
+        last = e["sha256"]
+    return entries
+
+
+def load_latest(name):
+    entries = snapshots(name)
+    if not entries:
+        return None
+    return load_object(entries[-1]["sha256"])
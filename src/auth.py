@@ -5,6 +5,8 @@ from urllib.parse import urlencode
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from dotenv import load_dotenv
 
+import users
+
 load_dotenv()
 
 CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
@@ -53,6 +55,9 @@ def get_tokens(code):
     return tokens
 
 if __name__ == "__main__":
+    # --user <name>: tokens go to data/users/<name>/.env (client id/secret stay in the root .env)
+    users.enter_user_dir()
+
     print("Opening browser for Spotify login...")
     code = get_auth_code()
     print("Received code. Exchanging for tokens...")
@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Memory budget for all cached datasets in one dashboard process
+CACHE_BUDGET_MB = int(os.getenv("WRAPPED_CACHE_MB", "512"))
+
+
+# -------------------------------
+# Helper: in-memory size of a cached value
+# -------------------------------
+def sizeof(value):
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, (list, tuple)):
+        return sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+# -------------------------------
+# Process-wide LRU cache of read-only datasets
+#   key = (user, dataset, data_version); every session gets the same objects
+#   back (no per-call copies), so callers must treat them as read-only
+# -------------------------------
+class DatasetCache:
+    def __init__(self, budget_mb=CACHE_BUDGET_MB):
+        self.budget = budget_mb * 1024 * 1024
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0     # dropped to stay within the budget
+        self.stale_drops = 0   # dropped because a newer data version was loaded
+
+        self._entries = OrderedDict()   # key -> (value, nbytes)
+        self._lock = threading.Lock()
+        self._loading = {}              # key -> lock, so one session loads while others wait
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+
+            try:
+                value = loader()
+                nbytes = sizeof(value)
+
+                with self._lock:
+                    self._drop_stale(key)
+                    self._entries[key] = (value, nbytes)
+                    self.used += nbytes
+                    self._evict(keep=key)
+            finally:
+                # Also when the loader raises, so the next caller retries
+                with self._lock:
+                    self._loading.pop(key, None)
+
+        return value
+
+    def _drop_stale(self, key):
+        # A new data version of a user's dataset makes the older versions dead weight
+        for old in [k for k in self._entries if k[:-1] == key[:-1] and k != key]:
+            self._remove(old)
+            self.stale_drops += 1
+
+    def _evict(self, keep):
+        while self.used > self.budget and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, nbytes = self._entries.pop(key)
+        self.used -= nbytes
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "used_mb": round(self.used / 1024 / 1024, 2),
+                "budget_mb": round(self.budget / 1024 / 1024, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_drops": self.stale_drops,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
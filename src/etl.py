@@ -2,6 +2,13 @@ import json
 import pandas as pd
 from pathlib import Path
 
+import archive
+import images
+import rollups
+import search
+import store
+import users
+
 RAW_DIR = Path("data/raw")
 CURATED_DIR = Path("data/curated")
 CURATED_DIR.mkdir(parents=True, exist_ok=True)
@@ -9,12 +16,65 @@ CURATED_DIR.mkdir(parents=True, exist_ok=True)
 
 # -----------------------------
 # Helper: load JSON safely
+#   latest archived snapshot first, then a plain data/raw/*.json file
 # -----------------------------
 def load_json(filename):
+    data = archive.load_latest(filename.removesuffix(".json"))
+    if data is not None:
+        return data
+
     with open(RAW_DIR / filename, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+# -----------------------------
+# Helper: display-ready artist names
+# -----------------------------
+def artist_names(artists):
+    if not isinstance(artists, list):
+        return ""
+    return ", ".join(a["name"] for a in artists)
+
+
+def artist_ids(artists):
+    # Local files come back with null ids
+    if not isinstance(artists, list):
+        return ""
+    return ",".join(a["id"] for a in artists if a.get("id"))
+
+
+# -----------------------------
+# Helper: recently played -> play store rows
+# -----------------------------
+def play_rows(df):
+    return pd.DataFrame({
+        "played_at": pd.to_datetime(df["played_at"], utc=True).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "name": df["track.name"],
+        "artists": df["track.artists"].apply(artist_names),
+        "album": df["track.album.name"],
+        "duration_min": (df["track.duration_ms"] / 60000).round(2),
+        # Local files have no track id; their uri is still stable per file,
+        # and the (played_at, track_id) key needs a value to de-duplicate on
+        "track_id": df["track.id"].fillna(df.get("track.uri", df["track.id"])),
+        "artist_ids": df["track.artists"].apply(artist_ids),
+        "album_id": df["track.album.id"],
+    })
+
+
+# -----------------------------
+# Helper: artist id -> name rows for the store
+# -----------------------------
+def artist_rows(artist_lists):
+    pairs = [
+        (a["id"], a["name"])
+        for artists in artist_lists if isinstance(artists, list)
+        for a in artists if a.get("id")
+    ]
+    df = pd.DataFrame(pairs, columns=["artist_id", "name"]).drop_duplicates("artist_id")
+    df["genres"] = None   # credits carry no genres; stored ones are kept
+    return df
+
+
 # -----------------------------
 # Process top tracks
 # -----------------------------
@@ -38,6 +98,23 @@ def process_top_tracks():
     tracks_df.to_csv(CURATED_DIR / "top_tracks.csv", index=False)
 
     print("✔ Saved: data/curated/top_tracks.csv")
+
+    # Display-ready copy for the paged table (no raw JSON columns)
+    display_df = pd.DataFrame({
+        "rank": tracks_df.groupby("time_range").cumcount() + 1,
+        "name": tracks_df["name"],
+        "artists": tracks_df["artists"].apply(artist_names),
+        "album": tracks_df["album.name"],
+        "time_range": tracks_df["time_range"],
+        "duration_min": tracks_df["duration_min"].round(2),
+        "popularity": tracks_df["popularity"],
+        "track_id": tracks_df["id"],
+        "artist_ids": tracks_df["artists"].apply(artist_ids),
+        "album_id": tracks_df["album.id"],
+    })
+    store.replace_table(display_df, "top_tracks")
+    store.append_rows(artist_rows(tracks_df["artists"]), "artists")
+
     return tracks_df
 
 
@@ -60,6 +137,14 @@ def process_top_artists():
     artists_df.to_csv(CURATED_DIR / "top_artists.csv", index=False)
 
     print("✔ Saved: data/curated/top_artists.csv")
+
+    # Genres are kept per artist in the store, so rollups of past periods
+    # still know them when the artist drops out of the current top artists
+    artist_store = artists_df[["id", "name"]].rename(columns={"id": "artist_id"})
+    artist_store["genres"] = artists_df["genres"].apply(
+        lambda g: json.dumps(g, ensure_ascii=False) if isinstance(g, list) else None
+    )
+    store.append_rows(artist_store.drop_duplicates("artist_id"), "artists")
     return artists_df
 
 
@@ -79,13 +164,18 @@ def process_recently_played():
     df.to_csv(CURATED_DIR / "recently_played.csv", index=False)
 
     print("✔ Saved: data/curated/recently_played.csv")
+
+    # Append to the play history (already-stored plays are not added again)
+    store.append_rows(play_rows(df), "plays")
+    store.append_rows(artist_rows(df["track.artists"]), "artists")
+
     return df
 
 
 # -----------------------------
 # Compute summary stats (Lite)
 # -----------------------------
-def compute_summary(tracks_df, recently_df):
+def compute_summary(tracks_df, artists_df, recently_df):
     print("\n▶ Computing Summary Insights...")
 
     summary = {}
@@ -95,6 +185,10 @@ def compute_summary(tracks_df, recently_df):
         tracks_df["duration_min"].sum(), 2
     )
 
+    # Unique counts for the Overview cards
+    summary["unique_tracks"] = int(tracks_df["name"].nunique())
+    summary["unique_artists"] = int(artists_df["name"].nunique())
+
     # Top 5 tracks
     summary["top_5_tracks"] = (
         tracks_df["name"]
@@ -103,14 +197,15 @@ def compute_summary(tracks_df, recently_df):
         .index.tolist()
     )
 
-    # Top 5 artists
-    summary["top_5_artists"] = (
+    # Top 5 artists (+ how many top tracks each has, for the Overview chart)
+    top_artists = (
         tracks_df["artists"]
         .apply(lambda x: x[0]["name"] if isinstance(x, list) else None)
         .value_counts()
         .head(5)
-        .index.tolist()
     )
+    summary["top_5_artists"] = top_artists.index.tolist()
+    summary["top_5_artist_counts"] = {k: int(v) for k, v in top_artists.items()}
 
     # Active listening hour
     recently_df["hour"] = recently_df["played_at"].dt.hour
@@ -134,11 +229,24 @@ if __name__ == "__main__":
     print("        ETL Pipeline")
     print("==============================\n")
 
+    # --user <name>: read and write data/users/<name>/data/
+    users.enter_user_dir()
+    CURATED_DIR.mkdir(parents=True, exist_ok=True)
+
     top_tracks = process_top_tracks()
     top_artists = process_top_artists()
     recently = process_recently_played()
 
     # In Lite Mode, no merging necessary
-    summary = compute_summary(top_tracks, recently)
+    summary = compute_summary(top_tracks, top_artists, recently)
+
+    # Local thumbnails for artist + album art
+    images.cache_thumbnails(images.image_urls(top_artists["images"], top_tracks["album.images"]))
+
+    # Per-period rollups (kept across runs for period comparisons)
+    rollups.build_rollups()
+
+    # Search index over everything now in the store
+    search.build_index(search.search_items())
 
     print("\n🎉 ETL complete! Curated data ready.")
@@ -1,9 +1,10 @@
 import os
-import json
 import time
 import requests
-from dotenv import load_dotenv
-from pathlib import Path
+from dotenv import load_dotenv, dotenv_values
+
+import archive
+import users
 
 load_dotenv()
 
@@ -12,36 +13,44 @@ ACCESS_TOKEN = os.getenv("ACCESS_TOKEN")
 BASE_URL = "https://api.spotify.com/v1"
 HEADERS = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
 
-RAW_DIR = Path("data/raw")
-RAW_DIR.mkdir(parents=True, exist_ok=True)
+TIMEOUT = 10          # seconds per request
+MAX_RETRIES = 3       # rate-limited retries before giving up
+MAX_RETRY_WAIT = 60   # longer Retry-After waits are left to the caller
+
+archive.RAW_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class TokenExpired(Exception):
+    pass
 
 
 # -------------------------------
-# Helper: save JSON
+# Helper: save JSON (compressed, content-addressed snapshot)
 # -------------------------------
 def save_json(data, filename):
-    path = RAW_DIR / filename
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    print(f"✔ Saved: {path}")
+    name = filename.removesuffix(".json")
+    digest, is_new = archive.store_snapshot(data, name)
+    state = "new snapshot" if is_new else "unchanged, deduplicated"
+    print(f"✔ Archived: {name} ({digest[:12]}, {state})")
 
 
 # -------------------------------
 # Helper: GET request with retry
 # -------------------------------
-def spotify_get(url, params=None):
-    response = requests.get(url, headers=HEADERS, params=params)
+def spotify_get(url, params=None, headers=None, retries=MAX_RETRIES):
+    response = requests.get(url, headers=headers or HEADERS, params=params, timeout=TIMEOUT)
 
     # Token expired
     if response.status_code == 401:
-        raise Exception("❌ Access token expired — refresh token needed.")
+        raise TokenExpired("❌ Access token expired — refresh token needed.")
 
     # Rate limited
     if response.status_code == 429:
         wait = int(response.headers.get("Retry-After", 2))
-        print(f"⏳ Rate limited, waiting {wait}s...")
-        time.sleep(wait)
-        return spotify_get(url, params)
+        if retries > 0 and wait <= MAX_RETRY_WAIT:
+            print(f"⏳ Rate limited, waiting {wait}s...")
+            time.sleep(wait)
+            return spotify_get(url, params, headers, retries - 1)
 
     response.raise_for_status()
     return response.json()
@@ -114,9 +123,14 @@ if __name__ == "__main__":
     print("  Spotify Data Fetch Script")
     print("==============================\n")
 
+    # --user <name>: that user's token, raw data under data/users/<name>/
+    if users.enter_user_dir() != "default":
+        ACCESS_TOKEN = dotenv_values(".env").get("ACCESS_TOKEN")
+        HEADERS = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
+
     top_tracks = fetch_top_tracks()
     top_artists = fetch_top_artists()
     recently = fetch_recently_played()
 
     print("\nSkipping audio features (Lite Mode enabled).")
-    print("🎉 All data fetched and saved in data/raw/")
+    print("🎉 All data fetched and archived in data/raw/")
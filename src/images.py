@@ -0,0 +1,102 @@
+import io
+import json
+import hashlib
+import requests
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PIL import Image
+
+# Streamlit serves <app dir>/static at app/static/ (server.enableStaticServing)
+STATIC_DIR = Path(__file__).parent / "static"
+THUMB_DIR = STATIC_DIR / "thumbs"
+THUMB_INDEX = Path("data/curated/thumbs.json")
+THUMB_URL = "app/static/thumbs"
+
+THUMB_SIZE = 160      # px, the largest size a card shows
+MAX_WORKERS = 8       # concurrent downloads
+TIMEOUT = 10          # seconds per download
+
+
+# -------------------------------
+# Helper: smallest image that still covers the thumbnail
+# -------------------------------
+def pick_image(images, size=THUMB_SIZE):
+    if not isinstance(images, list) or not images:
+        return None
+
+    def width(img):
+        return img.get("width") or float("inf")
+
+    big_enough = [img for img in images if width(img) >= size]
+    chosen = min(big_enough, key=width) if big_enough else max(images, key=width)
+    return chosen.get("url")
+
+
+def image_urls(*image_columns):
+    urls = {pick_image(images) for column in image_columns for images in column}
+    return sorted(u for u in urls if u)
+
+
+# -------------------------------
+# Helper: thumbnail index (source url -> thumbnail file)
+# -------------------------------
+def load_index(path=THUMB_INDEX):
+    if not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def thumb_url(index, url):
+    name = index.get(url)
+    return f"{THUMB_URL}/{name}" if name else None
+
+
+# -------------------------------
+# Download + resize one image (content-addressed by thumbnail bytes)
+# -------------------------------
+def make_thumbnail(url, size=THUMB_SIZE):
+    response = requests.get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+
+    img = Image.open(io.BytesIO(response.content)).convert("RGB")
+    img.thumbnail((size, size))
+
+    buf = io.BytesIO()
+    img.save(buf, format="WEBP", quality=80)
+    data = buf.getvalue()
+
+    name = hashlib.sha256(data).hexdigest() + ".webp"
+    path = THUMB_DIR / name
+    if not path.exists():
+        path.write_bytes(data)
+    return name
+
+
+# -------------------------------
+# Cache thumbnails for every url not cached yet
+# -------------------------------
+def cache_thumbnails(urls):
+    print("\n▶ Caching thumbnails...")
+
+    THUMB_DIR.mkdir(parents=True, exist_ok=True)
+    index = load_index()
+    todo = [u for u in urls if u not in index or not (THUMB_DIR / index[u]).exists()]
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {pool.submit(make_thumbnail, url): url for url in todo}
+        for future in as_completed(futures):
+            try:
+                index[futures[future]] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"⚠ Thumbnail failed: {futures[future]} ({e})")
+
+    THUMB_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    with open(THUMB_INDEX, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+    print(f"✔ Saved: {len(todo) - failed} new thumbnails in {THUMB_DIR} "
+          f"({len(urls) - len(todo)} already cached, {failed} failed)")
+    return index
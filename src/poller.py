@@ -0,0 +1,250 @@
+import os
+import sys
+import asyncio
+import requests
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from dotenv import dotenv_values, set_key
+
+import auth
+import etl
+import fetch_data
+import store
+import users
+
+USERS_DIR = users.USERS_DIR
+ROOT_ENV = Path(".env")
+
+PAGE_LIMIT = 50           # recently-played only ever returns the last 50 plays
+MIN_INTERVAL = 60         # seconds
+MAX_INTERVAL = 30 * 60    # 50 plays take well over 30 min, so idle back-off can't lose any
+SAFETY = 0.5              # poll by the time the 50-play window is half full
+RATE_SMOOTHING = 0.3      # EWMA weight of the latest observed play rate
+BACKOFF = 2               # idle polls stretch the interval by this factor
+MAX_CONCURRENT = 4        # simultaneous API calls across all users
+RETRY_INTERVAL = 15       # first retry after a failed poll, doubling up to the poll interval
+
+
+# -------------------------------
+# Helper: played_at -> datetime
+# -------------------------------
+def parse_played_at(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+# -------------------------------
+# Helper: users to poll
+#   default user from .env, others from data/users/<name>/.env
+#   (each user directory mirrors the repo root, so its store is <dir>/data/curated/wrapped.db)
+# -------------------------------
+def load_users():
+    users = []
+    if fetch_data.ACCESS_TOKEN:
+        users.append(UserPoller(
+            "default", fetch_data.ACCESS_TOKEN, store.DB_PATH,
+            refresh_token=os.getenv("REFRESH_TOKEN"), env_path=ROOT_ENV,
+        ))
+
+    for env in sorted(USERS_DIR.glob("*/.env")):
+        values = dotenv_values(env)
+        if values.get("ACCESS_TOKEN"):
+            users.append(UserPoller(
+                env.parent.name, values["ACCESS_TOKEN"], env.parent / store.DB_PATH,
+                refresh_token=values.get("REFRESH_TOKEN"), env_path=env,
+            ))
+
+    return users
+
+
+# -------------------------------
+# One user's polling state + schedule
+# -------------------------------
+class UserPoller:
+    def __init__(self, name, token, db_path, refresh_token=None, env_path=None):
+        self.name = name
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.refresh_token = refresh_token
+        self.env_path = env_path
+        self.db_path = Path(db_path)
+        self.cursor = self.last_stored_play()
+        self.rate = 0.0              # plays per second (smoothed)
+        self.interval = MIN_INTERVAL
+        self.failures = 0            # failed polls in a row
+
+    def last_stored_play(self):
+        if not self.db_path.exists():
+            return None
+
+        conn = store.connect(self.db_path)
+        try:
+            row = conn.execute("SELECT MAX(played_at) FROM plays").fetchone()
+        except Exception:
+            row = None
+        finally:
+            conn.close()
+
+        if not row or row[0] is None:
+            return None
+        return datetime.fromisoformat(row[0]).replace(tzinfo=timezone.utc)
+
+    def schedule(self, new_plays, elapsed):
+        # Window saturated: there may be more plays we could not see — catch up now
+        if new_plays >= PAGE_LIMIT:
+            print(f"⚠ [{self.name}] {new_plays} new plays in one poll — polling again to catch up")
+            self.interval = MIN_INTERVAL
+            return 1
+
+        # First poll only drains the backlog since the last run; it says nothing about the rate
+        if elapsed is None:
+            self.interval = MIN_INTERVAL
+            return self.interval
+
+        # Bursts raise the rate at once; quiet spells only lower it gradually
+        observed = new_plays / max(elapsed, 1)
+        self.rate = max(observed, RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.rate)
+
+        target = SAFETY * PAGE_LIMIT / self.rate if self.rate > 0 else MAX_INTERVAL
+        if new_plays == 0:
+            # Idle back-off, but never past what the (decaying) rate still allows
+            interval = min(self.interval * BACKOFF, target)
+        else:
+            interval = target
+
+        self.interval = min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+        return self.interval
+
+    def refresh(self):
+        # Exchange the refresh token for a new access token (and keep it in the user's .env)
+        if not self.refresh_token:
+            raise fetch_data.TokenExpired("❌ Access token expired and no REFRESH_TOKEN stored.")
+
+        response = requests.post(auth.TOKEN_URL, data={
+            "grant_type": "refresh_token",
+            "refresh_token": self.refresh_token,
+            "client_id": auth.CLIENT_ID,
+            "client_secret": auth.CLIENT_SECRET,
+        }, timeout=10)
+
+        if response.status_code in (400, 401):
+            raise fetch_data.TokenExpired(f"❌ Refresh token rejected: {response.text}")
+        response.raise_for_status()
+
+        tokens = response.json()
+        self.headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        self.refresh_token = tokens.get("refresh_token", self.refresh_token)
+
+        if self.env_path is not None and Path(self.env_path).exists():
+            set_key(self.env_path, "ACCESS_TOKEN", tokens["access_token"], quote_mode="never")
+            set_key(self.env_path, "REFRESH_TOKEN", self.refresh_token, quote_mode="never")
+
+        print(f"🔑 [{self.name}] Access token refreshed")
+
+    def fetch(self):
+        params = {"limit": PAGE_LIMIT}
+        if self.cursor is not None:
+            params["after"] = int(self.cursor.timestamp() * 1000)
+
+        url = f"{fetch_data.BASE_URL}/me/player/recently-played"
+        try:
+            return fetch_data.spotify_get(url, params=params, headers=self.headers)
+        except fetch_data.TokenExpired:
+            self.refresh()
+            return fetch_data.spotify_get(url, params=params, headers=self.headers)
+
+    def save(self, items):
+        # Rows are built per item so one malformed play is skipped instead of
+        # failing the batch (the cursor moves past it either way)
+        plays, artists = [], []
+        for item in items:
+            try:
+                df = pd.json_normalize([item])
+                plays.append(etl.play_rows(df))
+                artists.append(etl.artist_rows(df["track.artists"]))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                print(f"⚠ [{self.name}] skipped play at {item.get('played_at')}: {e!r}")
+
+        if not plays:
+            return
+
+        # One batch (one transaction) per poll
+        store.append_rows(pd.concat(plays, ignore_index=True), "plays", db_path=self.db_path)
+        store.append_rows(
+            pd.concat(artists, ignore_index=True).drop_duplicates("artist_id"), "artists", db_path=self.db_path
+        )
+
+    async def poll_once(self, limiter):
+        async with limiter:
+            data = await asyncio.to_thread(self.fetch)
+
+        items = [
+            i for i in data.get("items", [])
+            if self.cursor is None or parse_played_at(i["played_at"]) > self.cursor
+        ]
+        if items:
+            await asyncio.to_thread(self.save, items)
+            self.cursor = max(parse_played_at(i["played_at"]) for i in items)
+
+        return len(items)
+
+    async def run(self, limiter, once=False):
+        last_poll = None
+
+        while True:
+            started = asyncio.get_running_loop().time()
+            try:
+                new_plays = await self.poll_once(limiter)
+            except fetch_data.TokenExpired as e:
+                # Retrying can't fix this one — the user has to log in again
+                print(f"❌ [{self.name}] {str(e).removeprefix('❌ ')} Run auth.py for this user; stopped polling them.")
+                return
+            except Exception as e:
+                # Network blips / 5xx: retry soon, never later than the regular schedule
+                self.failures += 1
+                delay = min(RETRY_INTERVAL * BACKOFF ** (self.failures - 1), self.interval)
+                print(f"⚠ [{self.name}] poll failed ({e}) — retrying in {delay:.0f}s")
+                if once:
+                    return
+                await asyncio.sleep(delay)
+                continue
+
+            self.failures = 0
+            elapsed = started - last_poll if last_poll is not None else None
+            last_poll = started
+            delay = self.schedule(new_plays, elapsed)
+
+            print(f"✔ [{self.name}] {new_plays} new plays · "
+                  f"{self.rate * 3600:.1f} plays/h · next poll in {delay:.0f}s")
+
+            if once:
+                return
+            await asyncio.sleep(delay)
+
+
+# -------------------------------
+# Poll every user from one event loop
+# -------------------------------
+async def run_all(users, once=False):
+    limiter = asyncio.Semaphore(MAX_CONCURRENT)
+    await asyncio.gather(*(u.run(limiter, once) for u in users))
+
+
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    print("\n==============================")
+    print("   Recently Played Poller")
+    print("==============================\n")
+
+    users = load_users()
+    if not users:
+        print("No users with an ACCESS_TOKEN found — run auth.py first.")
+        sys.exit(1)
+
+    print(f"▶ Polling {len(users)} user(s): {', '.join(u.name for u in users)}")
+
+    try:
+        asyncio.run(run_all(users, once="--once" in sys.argv))
+    except KeyboardInterrupt:
+        print("\n👋 Poller stopped.")
@@ -0,0 +1,219 @@
+import json
+import pandas as pd
+from pathlib import Path
+
+import store
+
+CURATED_DIR = Path("data/curated")
+ROLLUP_DIR = CURATED_DIR / "rollups"
+
+GRANULARITIES = {"month": "%Y-%m", "year": "%Y"}
+
+
+# -----------------------------
+# Helper: rollup file paths
+# -----------------------------
+def rollup_path(granularity, period, rollup_dir=ROLLUP_DIR):
+    return Path(rollup_dir) / f"{granularity}-{period}.json"
+
+
+def list_periods(granularity, rollup_dir=ROLLUP_DIR):
+    return sorted(p.stem.split("-", 1)[1] for p in Path(rollup_dir).glob(f"{granularity}-*.json"))
+
+
+def load_rollup(granularity, period, rollup_dir=ROLLUP_DIR):
+    with open(rollup_path(granularity, period, rollup_dir), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _counts(df, key):
+    grouped = df.groupby(key).agg(plays=("played_at", "size"), minutes=("duration_min", "sum"))
+    grouped = grouped.sort_values("plays", ascending=False)
+    return {k: [int(p), round(float(m), 2)] for k, p, m in grouped.itertuples(name=None)}
+
+
+# -----------------------------
+# Helper: rollup state (last plays rowid already rolled up)
+# -----------------------------
+def state_path(rollup_dir=ROLLUP_DIR):
+    return Path(rollup_dir) / "state.json"
+
+
+def load_state(rollup_dir=ROLLUP_DIR):
+    path = state_path(rollup_dir)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, rollup_dir=ROLLUP_DIR):
+    with open(state_path(rollup_dir), "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+# -----------------------------
+# Build rollups for one year of plays
+#   periods -> {granularity: [period, ...]} to (re)write
+# -----------------------------
+def _write_rollups(plays, artists, periods):
+    plays["played_at"] = pd.to_datetime(plays["played_at"], utc=True)
+    plays["hour"] = plays["played_at"].dt.hour
+    plays["track"] = plays["name"] + " — " + plays["artists"]
+
+    # One row per credited artist (local files have none), with stored genres where known
+    credits = plays.assign(artist_id=plays["artist_ids"].str.split(",")).explode("artist_id")
+    credits = credits[credits["artist_id"].fillna("") != ""]
+    genres = (
+        artists.dropna(subset=["genres"])
+        .assign(genre=lambda df: df["genres"].apply(json.loads))
+        [["artist_id", "genre"]]
+        .explode("genre")
+        .dropna(subset=["genre"])
+    )
+    genre_plays = credits.merge(genres, on="artist_id", how="inner")
+    names = artists.set_index("artist_id")["name"]
+
+    written = []
+    for granularity, fmt in GRANULARITIES.items():
+        plays["period"] = plays["played_at"].dt.strftime(fmt)
+        credits["period"] = credits["played_at"].dt.strftime(fmt)
+        genre_plays["period"] = genre_plays["played_at"].dt.strftime(fmt)
+
+        hours = plays.groupby(["period", "hour"]).size().unstack(fill_value=0)
+        hours = hours.reindex(columns=range(24), fill_value=0)
+
+        play_groups = dict(tuple(plays.groupby("period")))
+        credit_groups = dict(tuple(credits.groupby("period")))
+        genre_groups = dict(tuple(genre_plays.groupby("period")))
+
+        for period in periods[granularity]:
+            if period not in play_groups:
+                continue
+            period_plays = play_groups[period]
+            period_credits = credit_groups.get(period, credits.iloc[:0])
+            period_genres = genre_groups.get(period, genre_plays.iloc[:0])
+
+            # Artists by id (names can repeat), each with its display name
+            artist_counts = _counts(period_credits, "artist_id")
+
+            rollup = {
+                "granularity": granularity,
+                "period": period,
+                "plays": int(len(period_plays)),
+                "minutes": round(float(period_plays["duration_min"].sum()), 2),
+                "unique_tracks": int(period_plays["track"].nunique()),
+                "unique_artists": int(period_credits["artist_id"].nunique()),
+                "hours": hours.loc[period].astype(int).tolist(),
+                "artists": {k: v + [str(names.get(k, k))] for k, v in artist_counts.items()},
+                "tracks": _counts(period_plays, "track"),
+                "genres": {g: int(n) for g, n in period_genres["genre"].value_counts().items()},
+            }
+
+            path = rollup_path(granularity, period)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rollup, f, separators=(",", ":"), ensure_ascii=False)
+            written.append(path)
+
+    return written
+
+
+# -----------------------------
+# Build rollups for the periods that got new plays since the last run
+#   closed periods are never re-read, so the cost follows new plays, not history
+# -----------------------------
+def build_rollups(db_path=store.DB_PATH):
+    print("\n▶ Building period rollups...")
+
+    ROLLUP_DIR.mkdir(parents=True, exist_ok=True)
+    last_rowid = load_state().get("last_rowid", 0)
+    written = []
+
+    conn = store.connect(db_path)
+    try:
+        # Plays are never deleted, so rowids past the last run are exactly the new plays
+        max_rowid = conn.execute("SELECT IFNULL(MAX(rowid), 0) FROM plays").fetchone()[0]
+        if last_rowid > max_rowid:
+            last_rowid = 0   # the play store was rebuilt — roll everything up again
+
+        months = [row[0] for row in conn.execute(
+            "SELECT DISTINCT substr(played_at, 1, 7) FROM plays WHERE rowid > ? ORDER BY 1", (last_rowid,)
+        )]
+        if not months:
+            print("No new plays since the last run — rollups up to date.")
+            return []
+
+        artists = pd.read_sql_query("SELECT artist_id, name, genres FROM artists", conn)
+
+        # One (indexed) range read per touched year covers its year and month rollups
+        for year in sorted({m[:4] for m in months}):
+            plays = pd.read_sql_query(
+                "SELECT played_at, name, artists, duration_min, artist_ids FROM plays "
+                "WHERE played_at >= ? AND played_at < ?",
+                conn, params=(f"{year}-01-01", f"{int(year) + 1}-01-01"),
+            )
+            periods = {"year": [year], "month": [m for m in months if m.startswith(year)]}
+            written += _write_rollups(plays, artists, periods)
+    finally:
+        conn.close()
+
+    save_state({"last_rowid": max_rowid})
+    print(f"✔ Saved: {len(written)} rollups in {ROLLUP_DIR} ({len(months)} month(s) with new plays)")
+    return written
+
+
+# -----------------------------
+# Compare two stored periods
+# -----------------------------
+def _delta_frame(base, other, label):
+    df = pd.DataFrame({
+        "base": pd.Series({k: v[0] if isinstance(v, list) else v for k, v in base.items()}, dtype="float64"),
+        "other": pd.Series({k: v[0] if isinstance(v, list) else v for k, v in other.items()}, dtype="float64"),
+    }).fillna(0)
+    df["delta"] = df["other"] - df["base"]
+    df = df.astype("int64").rename_axis(label).reset_index()
+    return df.sort_values(["other", "delta"], ascending=False).reset_index(drop=True)
+
+
+def compare(granularity, base_period, other_period, rollup_dir=ROLLUP_DIR):
+    base = load_rollup(granularity, base_period, rollup_dir)
+    other = load_rollup(granularity, other_period, rollup_dir)
+
+    metrics = ["plays", "minutes", "unique_tracks", "unique_artists"]
+    totals = pd.DataFrame({
+        "metric": metrics,
+        "base": [base[m] for m in metrics],
+        "other": [other[m] for m in metrics],
+    })
+    totals["delta"] = totals["other"] - totals["base"]
+
+    hours = pd.DataFrame({"hour": range(24), "base": base["hours"], "other": other["hours"]})
+    hours["delta"] = hours["other"] - hours["base"]
+
+    # Artists are keyed by id; the name rides along as the last list item
+    artists = _delta_frame(base["artists"], other["artists"], "artist_id")
+    names = {k: v[-1] for rollup in (base, other) for k, v in rollup["artists"].items()}
+    artists.insert(1, "artist", artists["artist_id"].map(names))
+
+    return {
+        "totals": totals,
+        "hours": hours,
+        "artists": artists,
+        "tracks": _delta_frame(base["tracks"], other["tracks"], "track"),
+        "genres": _delta_frame(base["genres"], other["genres"], "genre"),
+    }
+
+
+# -----------------------------
+# Totals for many periods at once
+# -----------------------------
+def period_totals(granularity, periods=None, rollup_dir=ROLLUP_DIR):
+    periods = periods or list_periods(granularity, rollup_dir)
+    rollups = [load_rollup(granularity, p, rollup_dir) for p in periods]
+    return pd.DataFrame({
+        "period": periods,
+        "plays": [r["plays"] for r in rollups],
+        "minutes": [r["minutes"] for r in rollups],
+        "unique_tracks": [r["unique_tracks"] for r in rollups],
+        "unique_artists": [r["unique_artists"] for r in rollups],
+    })
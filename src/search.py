@@ -0,0 +1,250 @@
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import store
+
+CURATED_DIR = Path("data/curated")
+INDEX_PATH = CURATED_DIR / "search_index.npz"
+
+N = 3                 # trigram index
+MIN_COVERAGE = 0.5    # share of query grams an item must contain (typo tolerance)
+
+KINDS = ["track", "artist", "album"]
+TEXT_FIELDS = ["key", "name", "detail", "last_played"]
+
+
+# -----------------------------
+# Helper: normalize + n-grams
+# -----------------------------
+def normalize(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def word_grams(word, prefix=False):
+    # Leading padding makes every word prefix a gram of its own;
+    # prefix=True leaves the end open so partially typed words match.
+    padded = " " * (N - 1) + word + ("" if prefix else " ")
+    return [padded[i:i + N] for i in range(len(padded) - N + 1)]
+
+
+def name_grams(name):
+    return {g for word in normalize(name).split() for g in word_grams(word)}
+
+
+def query_grams(query):
+    words = normalize(query).split()
+    grams = set()
+    for i, word in enumerate(words):
+        grams.update(word_grams(word, prefix=(i == len(words) - 1)))
+    return grams
+
+
+# -----------------------------
+# Helper: variable-length strings as one UTF-8 buffer + offsets
+#   (fixed-width <U arrays would pad every row to the longest string)
+# -----------------------------
+def pack_strings(values):
+    encoded = [str(v).encode("utf-8") for v in values]
+    total = sum(len(b) for b in encoded)
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32 if total < 2 ** 32 else np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_string(data, offsets, i):
+    return data[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+
+# -----------------------------
+# Build searchable items with play stats from the store
+# -----------------------------
+def search_items(db_path=store.DB_PATH):
+    print("\n▶ Collecting searchable items...")
+
+    conn = store.connect(db_path)
+    try:
+        plays = pd.read_sql_query(
+            "SELECT played_at, name, artists, album, duration_min, track_id, artist_ids, album_id FROM plays",
+            conn,
+        )
+        top_tracks = pd.read_sql_query("SELECT name, artists, album, track_id, album_id FROM top_tracks", conn)
+        artist_names = pd.read_sql_query("SELECT artist_id, name FROM artists", conn)
+    finally:
+        conn.close()
+
+    stats = {"plays": ("played_at", "size"), "minutes": ("duration_min", "sum"),
+             "last_played": ("played_at", "max")}
+
+    # Tracks
+    track_stats = plays.groupby("track_id").agg(**stats)
+    tracks = (
+        pd.concat([plays[["track_id", "name", "artists"]], top_tracks[["track_id", "name", "artists"]]])
+        .drop_duplicates("track_id")
+        .join(track_stats, on="track_id")
+        .rename(columns={"track_id": "key", "artists": "detail"})
+    )
+    tracks["kind"] = "track"
+
+    # Artists (every credited artist, not just the first)
+    credits = plays.assign(artist_id=plays["artist_ids"].str.split(",")).explode("artist_id")
+    artist_stats = credits.groupby("artist_id").agg(**stats)
+    artists = (
+        artist_names.join(artist_stats, on="artist_id")
+        .rename(columns={"artist_id": "key"})
+    )
+    artists["detail"] = ""
+    artists["kind"] = "artist"
+
+    # Albums (by id: different albums can share a title)
+    # plays stored before album ids were kept fall back to the album name
+    plays["album_id"] = plays["album_id"].fillna(plays["album"])
+    album_stats = plays.groupby("album_id").agg(**stats)
+    albums = (
+        pd.concat([plays[["album_id", "album", "artists"]], top_tracks[["album_id", "album", "artists"]]])
+        .dropna(subset=["album_id", "album"])
+        .drop_duplicates("album_id")
+        .join(album_stats, on="album_id")
+        .rename(columns={"album_id": "key", "album": "name", "artists": "detail"})
+    )
+    albums["kind"] = "album"
+
+    cols = ["kind", "key", "name", "detail", "plays", "minutes", "last_played"]
+    items = pd.concat([tracks[cols], artists[cols], albums[cols]], ignore_index=True)
+    items["plays"] = items["plays"].fillna(0).astype("int64")
+    items["minutes"] = items["minutes"].fillna(0).round(2)
+    items[["key", "name", "detail", "last_played"]] = items[["key", "name", "detail", "last_played"]].fillna("")
+
+    print(f"✔ Collected {len(items)} items")
+    return items
+
+
+# -----------------------------
+# Build the inverted index (CSR layout: gram -> item ids)
+# -----------------------------
+def build_index(items, path=INDEX_PATH):
+    print("\n▶ Building search index...")
+
+    gram_ids = {}
+    gram_rows, item_cols = [], []
+    gram_counts = np.zeros(len(items), dtype=np.int32)
+
+    for i, name in enumerate(items["name"]):
+        grams = name_grams(name)
+        gram_counts[i] = len(grams)
+        for g in grams:
+            gram_rows.append(gram_ids.setdefault(g, len(gram_ids)))
+            item_cols.append(i)
+
+    gram_rows = np.asarray(gram_rows, dtype=np.int64)
+    item_cols = np.asarray(item_cols, dtype=np.int32)
+
+    order = np.argsort(gram_rows, kind="stable")
+    offsets = np.zeros(len(gram_ids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(gram_rows, minlength=len(gram_ids)))
+
+    text = {}
+    for field in TEXT_FIELDS:
+        text[f"{field}_data"], text[f"{field}_offsets"] = pack_strings(items[field])
+
+    np.savez_compressed(
+        path,
+        grams=np.array(list(gram_ids), dtype=str),
+        offsets=offsets,
+        postings=item_cols[order],
+        gram_counts=gram_counts,
+        kind=pd.Categorical(items["kind"], categories=KINDS).codes.astype(np.int8),
+        plays=items["plays"].to_numpy(dtype=np.int64),
+        minutes=items["minutes"].to_numpy(dtype=np.float64),
+        **text,
+    )
+
+    print(f"✔ Saved: {path} ({len(items)} items, {len(gram_ids)} grams)")
+
+
+# -----------------------------
+# Query side
+# -----------------------------
+class SearchIndex:
+    def __init__(self, path=INDEX_PATH):
+        with np.load(path) as data:
+            if "name_data" not in data.files:
+                raise ValueError("Search index is in an older format — rebuild it with `python src/etl.py`.")
+            arrays = {k: data[k] for k in data.files}
+
+        self.gram_index = {g: i for i, g in enumerate(arrays.pop("grams").tolist())}
+        self.offsets = arrays.pop("offsets")
+        self.postings = arrays.pop("postings")
+        self.gram_counts = arrays.pop("gram_counts")
+        self.items = arrays
+
+    def __len__(self):
+        return len(self.gram_counts)
+
+    def search(self, query, kinds=None, limit=20):
+        grams = query_grams(query)
+        ids = [self.gram_index[g] for g in grams if g in self.gram_index]
+        if not ids:
+            return []
+
+        hits = np.concatenate([self.postings[self.offsets[g]:self.offsets[g + 1]] for g in ids])
+        matches = np.bincount(hits, minlength=len(self))
+        candidates = np.flatnonzero(matches >= MIN_COVERAGE * len(grams))
+
+        if kinds:
+            codes = [KINDS.index(k) for k in kinds]
+            candidates = candidates[np.isin(self.items["kind"][candidates], codes)]
+        if len(candidates) == 0:
+            return []
+
+        # Dice similarity on grams, ties broken by play count
+        m = matches[candidates]
+        score = 2 * m / (len(grams) + self.gram_counts[candidates])
+        plays = self.items["plays"][candidates]
+        order = np.lexsort((-plays, -score))[:limit]
+
+        # Only the top hits' strings are decoded
+        return [
+            {
+                "kind": KINDS[self.items["kind"][i]],
+                "name": self.text("name", i),
+                "detail": self.text("detail", i),
+                "plays": int(self.items["plays"][i]),
+                "minutes": float(self.items["minutes"][i]),
+                "last_played": self.text("last_played", i),
+                "score": round(float(s), 3),
+            }
+            for i, s in zip(candidates[order].tolist(), score[order])
+        ]
+
+    def text(self, field, i):
+        return unpack_string(self.items[f"{field}_data"], self.items[f"{field}_offsets"], i)
+
+    def memory_usage(self, deep=True):
+        # Lets the shared dataset cache charge the index against its budget
+        # (arrays + a rough per-entry cost for the gram lookup dict)
+        arrays = [self.offsets, self.postings, self.gram_counts, *self.items.values()]
+        return sum(a.nbytes for a in arrays) + 100 * len(self.gram_index)
+
+
+# -----------------------------
+# MAIN
+# -----------------------------
+if __name__ == "__main__":
+    import sys
+    import time
+
+    index = SearchIndex()
+    query = " ".join(sys.argv[1:]) or "summer"
+
+    start = time.perf_counter()
+    results = index.search(query)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for r in results:
+        print(f"{r['kind']:<7} {r['name']:<40} {r['plays']:>5} plays  ({r['score']})")
+    print(f"\n{len(results)} results in {elapsed:.2f} ms over {len(index)} items")
@@ -0,0 +1,290 @@
+import sqlite3
+from pathlib import Path
+
+CURATED_DIR = Path("data/curated")
+DB_PATH = CURATED_DIR / "wrapped.db"
+
+# -------------------------------
+# Table schemas (display-ready columns only)
+#   columns -> sqlite type
+#   key     -> unique key used to de-duplicate appended rows
+#   sort    -> columns the paged table can sort by (indexed, stored NOT NULL-ish
+#              so keyset pagination never has to step over NULLs)
+#   filter  -> columns with equality filters (indexed)
+#   search  -> columns in the full-text index behind the free-text filter
+# -------------------------------
+TABLES = {
+    "top_tracks": {
+        "columns": {
+            "rank": "INTEGER",
+            "name": "TEXT",
+            "artists": "TEXT",
+            "album": "TEXT",
+            "time_range": "TEXT",
+            "duration_min": "REAL",
+            "popularity": "INTEGER",
+            "track_id": "TEXT",
+            "artist_ids": "TEXT",
+            "album_id": "TEXT",
+        },
+        "key": None,
+        "sort": ["rank", "name", "artists", "album", "time_range", "duration_min", "popularity"],
+        "filter": ["time_range"],
+        "search": ["name", "artists", "album"],
+    },
+    "plays": {
+        "columns": {
+            "played_at": "TEXT",
+            "name": "TEXT",
+            "artists": "TEXT",
+            "album": "TEXT",
+            "duration_min": "REAL",
+            "track_id": "TEXT",
+            "artist_ids": "TEXT",
+            "album_id": "TEXT",
+        },
+        "key": ["played_at", "track_id"],
+        "sort": ["played_at", "name", "artists", "duration_min"],
+        "filter": [],
+        "search": ["name", "artists", "album"],
+    },
+    "artists": {
+        "columns": {
+            "artist_id": "TEXT",
+            "name": "TEXT",
+            "genres": "TEXT",     # JSON list; NULL until the artist shows up in top artists
+        },
+        "key": ["artist_id"],
+        "sort": [],
+        "filter": [],
+        "search": [],
+    },
+}
+
+
+# -------------------------------
+# Helper: open the store
+# -------------------------------
+def connect(db_path=DB_PATH):
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    return sqlite3.connect(db_path)
+
+
+def _indexed(table):
+    schema = TABLES[table]
+    return list(dict.fromkeys(schema["sort"] + schema["filter"]))
+
+
+def create_table(conn, table):
+    schema = TABLES[table]
+    cols = ", ".join(f'"{c}" {t}' for c, t in schema["columns"].items())
+    if schema["key"]:
+        cols += ", UNIQUE (" + ", ".join(f'"{c}"' for c in schema["key"]) + ")"
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({cols})')
+
+    # Stores built before a column existed get it added (NULL for old rows)
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+    for col, col_type in schema["columns"].items():
+        if col not in existing:
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{col}" {col_type}')
+
+    # Only sort / filter columns are indexed; drop indexes older stores built on the rest
+    indexed = _indexed(table)
+    for col in schema["columns"]:
+        if col in indexed:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{col}" ON "{table}" ("{col}")')
+        else:
+            conn.execute(f'DROP INDEX IF EXISTS "idx_{table}_{col}"')
+
+    if schema["search"]:
+        create_search_index(conn, table)
+
+
+def create_search_index(conn, table):
+    # External-content FTS5 table kept in sync by triggers (upserts that skip
+    # unchanged duplicates fire no trigger, so nothing is indexed twice)
+    fts = f"{table}_fts"
+    cols = TABLES[table]["search"]
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+
+    col_list = ", ".join(f'"{c}"' for c in cols)
+    new_values = ", ".join(f'new."{c}"' for c in cols)
+    old_values = ", ".join(f'old."{c}"' for c in cols)
+    insert_new = f'INSERT INTO "{fts}"(rowid, {col_list}) VALUES (new.rowid, {new_values});'
+    delete_old = f'INSERT INTO "{fts}"("{fts}", rowid, {col_list}) VALUES (\'delete\', old.rowid, {old_values});'
+
+    if not exists:
+        conn.execute(
+            f'CREATE VIRTUAL TABLE "{fts}" USING fts5({col_list}, content="{table}", '
+            f"content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    conn.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{table}" BEGIN {insert_new} END')
+    conn.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{table}" BEGIN {delete_old} END')
+    conn.execute(f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{table}" BEGIN {delete_old} {insert_new} END')
+
+    if not exists:
+        # Rows stored before the index existed
+        conn.execute(f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')')
+
+
+def _records(df, table):
+    schema = TABLES[table]
+    cols = list(schema["columns"])
+    df = df[cols].copy()
+
+    # UNIQUE never matches NULLs, so key columns get the same fill or
+    # re-appended rows would be stored again
+    for col in dict.fromkeys(schema["sort"] + (schema["key"] or [])):
+        df[col] = df[col].fillna("" if schema["columns"][col] == "TEXT" else 0)
+
+    df = df.astype(object).where(df.notna(), None)
+    return cols, df.itertuples(index=False, name=None)
+
+
+def _insert_sql(table, cols, verb="INSERT"):
+    names = ", ".join(f'"{c}"' for c in cols)
+    placeholders = ", ".join("?" for _ in cols)
+    return f'{verb} INTO "{table}" ({names}) VALUES ({placeholders})'
+
+
+def _upsert_sql(table, cols):
+    # A row that is already stored keeps its values, except where the new row
+    # brings a different non-NULL one (ids or genres stored after the row was)
+    key = TABLES[table]["key"]
+    rest = [c for c in cols if c not in key]
+    updates = ", ".join(f'"{c}" = COALESCE(excluded."{c}", "{c}")' for c in rest)
+    changed = " OR ".join(f'(excluded."{c}" IS NOT NULL AND excluded."{c}" IS NOT "{c}")' for c in rest)
+    conflict = ", ".join(f'"{c}"' for c in key)
+    return f"{_insert_sql(table, cols)} ON CONFLICT ({conflict}) DO UPDATE SET {updates} WHERE {changed}"
+
+
+# -------------------------------
+# Write: replace a whole table
+# -------------------------------
+def replace_table(df, table, db_path=DB_PATH):
+    cols, records = _records(df, table)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute(f'DROP TABLE IF EXISTS "{table}_fts"')
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+            create_table(conn, table)
+            conn.executemany(_insert_sql(table, cols), records)
+    finally:
+        conn.close()
+
+    print(f"✔ Stored: {table} ({len(df)} rows) in {db_path}")
+
+
+# -------------------------------
+# Write: append rows, updating ones already stored
+# -------------------------------
+def append_rows(df, table, db_path=DB_PATH):
+    cols, records = _records(df, table)
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            create_table(conn, table)
+            # rowids only grow (rows are never deleted), so MAX(rowid) counts new rows
+            # without the FTS trigger writes that total_changes would include
+            last = f'SELECT IFNULL(MAX(rowid), 0) FROM "{table}"'
+            before = conn.execute(last).fetchone()[0]
+            conn.executemany(_upsert_sql(table, cols), records)
+            added = conn.execute(last).fetchone()[0] - before
+    finally:
+        conn.close()
+
+    print(f"✔ Stored: {added} new rows in {table}")
+    return added
+
+
+# -------------------------------
+# Read: one page, sorted + filtered inside sqlite
+# -------------------------------
+def match_query(search):
+    # Every word must match as a word prefix: "sam fen" -> "sam"* AND "fen"*
+    words = [w.replace('"', '""') for w in search.split()]
+    return " AND ".join(f'"{w}"*' for w in words)
+
+
+def _where(table, filters, search):
+    clauses, params = [], []
+
+    for col, value in filters:
+        if col not in TABLES[table]["filter"]:
+            raise ValueError(f"Not a filter column for {table}: {col}")
+        clauses.append(f'"{col}" = ?')
+        params.append(value)
+
+    if search and search.split():
+        if not TABLES[table]["search"]:
+            raise ValueError(f"{table} has no search index")
+        clauses.append(f'rowid IN (SELECT rowid FROM "{table}_fts" WHERE "{table}_fts" MATCH ?)')
+        params.append(match_query(search))
+
+    return clauses, params
+
+
+def count_rows(table, filters=(), search="", db_path=DB_PATH):
+    clauses, params = _where(table, filters, search)
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+    conn = connect(db_path)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def query_page(table, columns, sort_by, descending=False, filters=(), search="",
+               after=None, page_size=50, db_path=DB_PATH):
+    # Keyset pagination: `after` is the (sort value, rowid) of the previous page's
+    # last row, so every page is an index range scan instead of an OFFSET walk.
+    # Returns the rows and the cursor for the next page (None on the last page).
+    known = TABLES[table]["columns"]
+    for col in columns:
+        if col not in known:
+            raise ValueError(f"Unknown column for {table}: {col}")
+    if sort_by not in TABLES[table]["sort"]:
+        raise ValueError(f"Not a sort column for {table}: {sort_by}")
+
+    clauses, params = _where(table, filters, search)
+    if after is not None:
+        clauses.append(f'("{sort_by}", rowid) {"<" if descending else ">"} (?, ?)')
+        params.extend(after)
+
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    select = ", ".join(f'"{c}"' for c in columns)
+    direction = "DESC" if descending else "ASC"
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f'SELECT {select}, "{sort_by}", rowid FROM "{table}"{where} '
+            f'ORDER BY "{sort_by}" {direction}, rowid {direction} LIMIT ?',
+            params + [page_size],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    cursor = tuple(rows[-1][-2:]) if len(rows) == page_size else None
+    return [dict(zip(columns, row)) for row in rows], cursor
+
+
+def distinct_values(table, column, db_path=DB_PATH):
+    if column not in TABLES[table]["filter"]:
+        raise ValueError(f"Not a filter column for {table}: {column}")
+
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            f'SELECT DISTINCT "{column}" FROM "{table}" ORDER BY "{column}"'
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [r[0] for r in rows if r[0] is not None]
@@ -1,13 +1,24 @@
+import time
+
+# Script start — first paint is measured from here
+START = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
 from pathlib import Path
+from datetime import datetime, timezone
 import ast
+import json
+import re
 import subprocess
-import time
-import plotly.graph_objects as go
-import plotly.io as pio
+
+# pandas, plotly, numpy and the modules built on them are imported
+# inside the pages that need them, so Overview paints without them.
+import cache
+import store
 
 CURATED_DIR = Path("data/curated")
+USERS_DIR = Path("data/users")
+PAINT_LOG = CURATED_DIR / "paint_times.jsonl"
 
 # ----------------------------------------
 # Page Config
@@ -18,6 +29,20 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ----------------------------------------
+# Current User (?user=<name>, data in data/users/<name>/data/curated,
+# written by `python src/etl.py --user <name>`)
+# ----------------------------------------
+def current_user():
+    user = st.query_params.get("user", "default")
+    return user if re.fullmatch(r"[A-Za-z0-9_-]{1,64}", user) else "default"
+
+def curated_dir(user):
+    return CURATED_DIR if user == "default" else USERS_DIR / user / CURATED_DIR
+
+USER = current_user()
+USER_DIR = curated_dir(USER)
+
 # ----------------------------------------
 # Session State for Navigation
 # ----------------------------------------
@@ -114,23 +139,6 @@ header, footer {visibility: hidden;}
     border: 1px solid rgba(255,255,255,0.07);
 }
 
-/* Artist Cards */
-.carousel-container {
-    white-space: nowrap;
-    overflow-x: auto;
-    padding-bottom: 12px;
-}
-
-.artist-card {
-    display: inline-block;
-    width: 220px;
-    padding: 16px;
-    margin-right: 16px;
-    border-radius: 14px;
-    background: rgba(255,255,255,0.05);
-    backdrop-filter: blur(8px);
-}
-
 </style>
 
 """, unsafe_allow_html=True)
@@ -141,11 +149,15 @@ header, footer {visibility: hidden;}
 nav_options = [
     "Overview",
     "Top Tracks",
+    "Listening History",
+    "Search",
     "Top Artists",
     "Genre Insights",
     "Listening Patterns",
     "Daily Trend",
-    "Duration Stats"
+    "Duration Stats",
+    "Compare Periods",
+    "Artist Graph"
 ]
 
 cols = st.columns(len(nav_options))
@@ -175,6 +187,8 @@ for idx, name in enumerate(nav_options):
 # CSV Loader Helpers
 # ----------------------------------------
 def robust_read_csv(path):
+    import pandas as pd
+
     df = pd.read_csv(path)
 
     # Remove header-as-row if present
@@ -189,14 +203,19 @@ def robust_read_csv(path):
     df.columns = [str(c).strip() for c in df.columns]
     return df
 
-def ensure_curated_files():
+def ensure_curated_files(curated=CURATED_DIR):
     required = [
         "top_tracks.csv", "top_artists.csv", "recently_played.csv",
         "genre_summary.csv", "listening_by_hour.csv",
         "listening_daily.csv", "duration_stats.csv",
-        "artist_frequency.csv"
+        "artist_frequency.csv", "wrapped_summary.json"
     ]
-    missing = [f for f in required if not (CURATED_DIR / f).exists()]
+    missing = [f for f in required if not (curated / f).exists()]
+    if missing and curated != CURATED_DIR:
+        st.error(f"No curated data for user '{USER}' in {curated} — run "
+                 f"`python src/fetch_data.py --user {USER}`, then `src/etl.py` and "
+                 f"`src/analysis.py` with the same `--user {USER}`.")
+        st.stop()
     if missing:
         st.warning("Missing curated files — running ETL pipeline...")
         try:
@@ -211,6 +230,8 @@ def ensure_curated_files():
 # Neon Charts
 # ----------------------------------------
 def neon_bar_chart(df, x, y, title):
+    import plotly.graph_objects as go
+
     # Guard against empty df or missing columns
     if df is None or df.empty or x not in df.columns or y not in df.columns:
         return go.Figure()
@@ -227,6 +248,8 @@ def neon_bar_chart(df, x, y, title):
     return fig
 
 def neon_line_chart(df, x, y, title):
+    import plotly.graph_objects as go
+
     if df is None or df.empty or x not in df.columns or y not in df.columns:
         return go.Figure()
     fig = go.Figure()
@@ -243,18 +266,92 @@ def neon_line_chart(df, x, y, title):
     )
     return fig
 
+# ----------------------------------------
+# Paged Table (sorted / filtered / paged inside the store)
+# ----------------------------------------
+def store_version(db_path):
+    return db_path.stat().st_mtime if db_path.exists() else 0
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_count(db_path, table, filters, search, version):
+    return store.count_rows(table, filters, search, db_path=db_path)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_page(db_path, table, columns, sort_by, descending, filters, search, after, page_size, version):
+    return store.query_page(table, list(columns), sort_by, descending, filters, search, after, page_size, db_path=db_path)
+
+def _next_page(key, cursor):
+    st.session_state[f"{key}_cursors"].append(cursor)
+
+def _prev_page(key):
+    st.session_state[f"{key}_cursors"].pop()
+
+def paged_table(table, columns, default_sort, default_desc=False, filter_col=None, page_size=50):
+    db_path = USER_DIR / store.DB_PATH.name
+    if not db_path.exists():
+        st.info("Curated store not built yet — run `python src/etl.py`.")
+        return
+
+    key = f"pt_{table}"
+    version = store_version(db_path)
+    sortable = [c for c in columns if c in store.TABLES[table]["sort"]]
+
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 2])
+    search = c1.text_input("Search", key=f"{key}_search", placeholder="Track, artist or album").strip()
+    sort_by = c2.selectbox("Sort by", sortable, index=sortable.index(default_sort), key=f"{key}_sort")
+    descending = c3.checkbox("Descending", value=default_desc, key=f"{key}_desc")
+
+    filters = ()
+    if filter_col:
+        options = ["All"] + store.distinct_values(table, filter_col, db_path=db_path)
+        choice = c4.selectbox(filter_col.replace("_", " ").title(), options, key=f"{key}_filter")
+        if choice != "All":
+            filters = ((filter_col, choice),)
+
+    # Keyset pages: a stack of cursors (last row of each previous page),
+    # started over whenever the ordering or the result set changes
+    view = (sort_by, descending, filters, search, version)
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[f"{key}_cursors"] = [None]
+    cursors = st.session_state[f"{key}_cursors"]
+
+    total = fetch_count(str(db_path), table, filters, search, version)
+    pages = max(1, -(-total // page_size))
+
+    rows, next_cursor = fetch_page(str(db_path), table, tuple(columns), sort_by, descending, filters, search, cursors[-1], page_size, version)
+    st.dataframe(rows, hide_index=True, width="stretch")
+
+    c1, c2, c3 = st.columns([1, 1, 6])
+    c1.button("◀ Prev", key=f"{key}_prev", disabled=len(cursors) == 1,
+              on_click=_prev_page, args=(key,))
+    c2.button("Next ▶", key=f"{key}_next", disabled=next_cursor is None or len(cursors) >= pages,
+              on_click=_next_page, args=(key, next_cursor))
+    c3.caption(f"{total:,} rows · page {len(cursors)} of {pages}")
+
 # ----------------------------------------
 # Load Data
 # ----------------------------------------
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def shared_cache():
+    return cache.DatasetCache()
+
+def data_version(curated):
+    return max((p.stat().st_mtime_ns for p in curated.glob("*.csv")), default=0)
+
 def load_data():
-    ensure_curated_files()
+    ensure_curated_files(USER_DIR)
+    key = (USER, "curated", data_version(USER_DIR))
+    return shared_cache().get(key, lambda: read_curated(USER_DIR))
 
-    tracks = robust_read_csv(CURATED_DIR / "top_tracks.csv")
-    artists = robust_read_csv(CURATED_DIR / "top_artists.csv")
-    recently = robust_read_csv(CURATED_DIR / "recently_played.csv")
+def read_curated(curated):
+    import pandas as pd
 
-    genre = robust_read_csv(CURATED_DIR / "genre_summary.csv")
+    tracks = robust_read_csv(curated / "top_tracks.csv")
+    artists = robust_read_csv(curated / "top_artists.csv")
+    recently = robust_read_csv(curated / "recently_played.csv")
+
+    genre = robust_read_csv(curated / "genre_summary.csv")
     # Normalize genre
     if genre.shape[1] >= 2:
         genre = genre.iloc[:, :2]
@@ -263,7 +360,7 @@ def load_data():
         genre.columns = ["genre"]
         genre["count"] = 1
 
-    hourly = robust_read_csv(CURATED_DIR / "listening_by_hour.csv")
+    hourly = robust_read_csv(curated / "listening_by_hour.csv")
     if hourly.shape[1] >= 2:
         hourly = hourly.iloc[:, :2]
         hourly.columns = ["hour", "count"]
@@ -271,7 +368,7 @@ def load_data():
         hourly.columns = ["hour"]
         hourly["count"] = 1
 
-    daily = robust_read_csv(CURATED_DIR / "listening_daily.csv")
+    daily = robust_read_csv(curated / "listening_daily.csv")
     if daily.shape[1] >= 2:
         daily = daily.iloc[:, :2]
         daily.columns = ["date", "plays"]
@@ -281,12 +378,12 @@ def load_data():
     daily["date"] = pd.to_datetime(daily["date"], errors="coerce")
     daily = daily.dropna(subset=["date"]).reset_index(drop=True)
 
-    duration_stats = robust_read_csv(CURATED_DIR / "duration_stats.csv")
+    duration_stats = robust_read_csv(curated / "duration_stats.csv")
     if duration_stats.shape[1] >= 2:
         duration_stats = duration_stats.iloc[:, :2]
         duration_stats.columns = ["metric", "value"]
 
-    artist_freq = robust_read_csv(CURATED_DIR / "artist_frequency.csv")
+    artist_freq = robust_read_csv(curated / "artist_frequency.csv")
     if artist_freq.shape[1] >= 2:
         artist_freq = artist_freq.iloc[:, :2]
         artist_freq.columns = ["artist", "count"]
@@ -299,7 +396,50 @@ def load_data():
 
     return tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently
 
-tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
+# ----------------------------------------
+# Overview Summary (small precomputed artifact from the ETL)
+# ----------------------------------------
+@st.cache_data(show_spinner=False)
+def load_summary(path, version):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def summary_path():
+    path = USER_DIR / "wrapped_summary.json"
+    if not path.exists():
+        ensure_curated_files(USER_DIR)
+    return path
+
+# ----------------------------------------
+# First-paint tracking
+#   one line per session in paint_times.jsonl; "cold" marks the first
+#   paint served by a freshly started dashboard process
+# ----------------------------------------
+@st.cache_resource
+def process_state():
+    return {"painted": False}
+
+def record_first_paint(page):
+    if st.session_state.get("first_paint_ms") is not None:
+        return st.session_state["first_paint_ms"]
+
+    ms = round((time.perf_counter() - START) * 1000, 1)
+    state = process_state()
+    entry = {
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "page": page,
+        "ms": ms,
+        "cold": not state["painted"],
+    }
+    state["painted"] = True
+    st.session_state["first_paint_ms"] = ms
+
+    try:
+        with open(PAINT_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+    return ms
 
 # ----------------------------------------
 # PAGES
@@ -316,9 +456,11 @@ if st.session_state["page"] == "Overview":
     </p>
     """, unsafe_allow_html=True)
 
-    total_minutes = round(tracks["duration_min"].sum(), 2) if "duration_min" in tracks.columns else 0
-    unique_tracks = tracks["name"].nunique() if "name" in tracks.columns else 0
-    unique_artists = artists["name"].nunique() if "name" in artists.columns else 0
+    path = summary_path()
+    summary = load_summary(str(path), path.stat().st_mtime)
+    total_minutes = summary.get("total_minutes_top_tracks", 0)
+    unique_tracks = summary.get("unique_tracks", "-")
+    unique_artists = summary.get("unique_artists", "-")
 
     c1, c2, c3 = st.columns(3)
 
@@ -326,8 +468,15 @@ if st.session_state["page"] == "Overview":
     c2.markdown(f"<div class='metric-box'><div class='metric-label'>🎶 Unique Tracks</div><div class='metric-value'>{unique_tracks}</div></div>", unsafe_allow_html=True)
     c3.markdown(f"<div class='metric-box'><div class='metric-label'>🧑‍🎤 Unique Artists</div><div class='metric-value'>{unique_artists}</div></div>", unsafe_allow_html=True)
 
+    record_first_paint("Overview")
+
+    # Chart comes after the cards have been sent, so plotly loads off the critical path
+    import pandas as pd
+
     st.subheader("Top 5 Artists")
-    fig = neon_bar_chart(artist_freq.head(5), "artist", "count", "Top Artists")
+    counts = summary.get("top_5_artist_counts", {})
+    top5 = pd.DataFrame({"artist": list(counts), "count": list(counts.values())})
+    fig = neon_bar_chart(top5, "artist", "count", "Top Artists")
     st.plotly_chart(fig, width="stretch")
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -336,7 +485,62 @@ if st.session_state["page"] == "Overview":
 elif st.session_state["page"] == "Top Tracks":
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.title("Top Tracks")
-    st.dataframe(tracks[["name", "artists", "time_range", "duration_min"]].fillna("-"))
+    paged_table(
+        "top_tracks",
+        ["rank", "name", "artists", "album", "time_range", "duration_min", "popularity"],
+        default_sort="rank",
+        filter_col="time_range",
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# -------------------- Listening History --------------------
+elif st.session_state["page"] == "Listening History":
+    st.markdown("<div class='section'>", unsafe_allow_html=True)
+    st.title("Listening History")
+    paged_table(
+        "plays",
+        ["played_at", "name", "artists", "album", "duration_min"],
+        default_sort="played_at",
+        default_desc=True,
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# -------------------- Search --------------------
+elif st.session_state["page"] == "Search":
+    st.markdown("<div class='section'>", unsafe_allow_html=True)
+    st.title("Search")
+
+    import search
+
+    index_path = USER_DIR / search.INDEX_PATH.name
+    index = None
+    if not index_path.exists():
+        st.info("Search index not built yet — run `python src/etl.py`.")
+    else:
+        # Shared across sessions through the budgeted cache; a rebuilt index
+        # (new mtime) replaces the old one instead of piling up next to it
+        key = (USER, "search_index", index_path.stat().st_mtime_ns)
+        try:
+            index = shared_cache().get(key, lambda: search.SearchIndex(index_path))
+        except ValueError as e:
+            st.info(str(e))
+
+    if index is not None:
+        c1, c2 = st.columns([3, 2])
+        query = c1.text_input("Search tracks, artists and albums", key="search_query")
+        kinds = c2.multiselect("Only", search.KINDS, key="search_kinds")
+
+        if query.strip():
+            start = time.perf_counter()
+            results = index.search(query, kinds=kinds)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            if results:
+                st.dataframe(results, hide_index=True, width="stretch")
+            else:
+                st.info("No matches.")
+            st.caption(f"{len(results)} results in {elapsed:.1f} ms over {len(index):,} items")
+
     st.markdown("</div>", unsafe_allow_html=True)
 
 # -------------------- Top Artists --------------------
@@ -345,8 +549,45 @@ elif st.session_state["page"] == "Top Artists":
     st.title("Top Artists")
     st.subheader("Artist Carousel")
 
-    st.markdown("<div class='carousel-container'>", unsafe_allow_html=True)
+    st.markdown("""
+    <style>
+    /* Artist Cards */
+    .carousel-container {
+        white-space: nowrap;
+        overflow-x: auto;
+        padding-bottom: 12px;
+    }
+
+    .artist-card {
+        display: inline-block;
+        width: 220px;
+        padding: 16px;
+        margin-right: 16px;
+        border-radius: 14px;
+        background: rgba(255,255,255,0.05);
+        backdrop-filter: blur(8px);
+        vertical-align: top;
+    }
+
+    .artist-card img {
+        width: 160px;
+        height: 160px;
+        object-fit: cover;
+        border-radius: 10px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+    tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
+
+    # Art comes from the local thumbnail cache (served by Streamlit's static route)
+    import images
 
+    thumb_index = USER_DIR / images.THUMB_INDEX.name
+    index_mtime = thumb_index.stat().st_mtime_ns if thumb_index.exists() else 0
+    thumbs = shared_cache().get((USER, "thumbs", index_mtime), lambda: images.load_index(thumb_index))
+
+    cards = []
     for _, row in artists.head(15).iterrows():
         name = row.get("name", "Unknown")
         genres_raw = row.get("genres", "[]")
@@ -354,14 +595,21 @@ elif st.session_state["page"] == "Top Artists":
             genres = ast.literal_eval(genres_raw) if isinstance(genres_raw, str) else genres_raw
         except Exception:
             genres = []
-        st.markdown(f"""
-        <div class='artist-card'>
-            <h4>{name}</h4>
-            <p style='font-size:12px; opacity:0.8'>{' • '.join(genres[:3])}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        if not isinstance(genres, list):
+            genres = []
 
-    st.markdown("</div>", unsafe_allow_html=True)
+        try:
+            art = images.pick_image(ast.literal_eval(row.get("images", "[]")))
+        except Exception:
+            art = None
+        src = images.thumb_url(thumbs, art) if art else None
+        img = f"<img src='{src}' loading='lazy' alt=''>" if src else ""
+
+        cards.append(f"<div class='artist-card'>{img}<h4>{name}</h4>"
+                     f"<p style='font-size:12px; opacity:0.8'>{' • '.join(genres[:3])}</p></div>")
+
+    # One block for the whole carousel, so cards actually sit side by side
+    st.markdown(f"<div class='carousel-container'>{''.join(cards)}</div>", unsafe_allow_html=True)
 
     st.subheader("Wrapped Slide")
     # Guard popularity column
@@ -369,6 +617,8 @@ elif st.session_state["page"] == "Top Artists":
         slide = neon_bar_chart(artists.head(5), "name", "popularity", "Your Top Artists")
         st.plotly_chart(slide, width="stretch")
         try:
+            import plotly.io as pio
+
             png = pio.to_image(slide, format="png")
             st.download_button("Download PNG", png, "top_artists.png", "image/png")
         except Exception:
@@ -382,6 +632,7 @@ elif st.session_state["page"] == "Top Artists":
 elif st.session_state["page"] == "Genre Insights":
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.title("Genre Insights")
+    tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
     fig = neon_bar_chart(genre, "genre", "count", "Genres")
     st.plotly_chart(fig, width="stretch")
     st.markdown("</div>", unsafe_allow_html=True)
@@ -390,6 +641,7 @@ elif st.session_state["page"] == "Genre Insights":
 elif st.session_state["page"] == "Listening Patterns":
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.title("Listening Patterns")
+    tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
     fig = neon_bar_chart(hourly.sort_values("hour"), "hour", "count", "By Hour")
     st.plotly_chart(fig, width="stretch")
     st.markdown("</div>", unsafe_allow_html=True)
@@ -398,6 +650,7 @@ elif st.session_state["page"] == "Listening Patterns":
 elif st.session_state["page"] == "Daily Trend":
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.title("Daily Trend")
+    tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
     fig = neon_line_chart(daily.sort_values("date"), "date", "plays", "Daily Listening")
     st.plotly_chart(fig, width="stretch")
     st.markdown("</div>", unsafe_allow_html=True)
@@ -406,7 +659,92 @@ elif st.session_state["page"] == "Daily Trend":
 elif st.session_state["page"] == "Duration Stats":
     st.markdown("<div class='section'>", unsafe_allow_html=True)
     st.title("Duration Statistics")
+    tracks, artists, genre, hourly, daily, duration_stats, artist_freq, recently = load_data()
     st.dataframe(duration_stats)
     fig = neon_bar_chart(tracks.reset_index(), "index", "duration_min", "Track Duration Distribution")
     st.plotly_chart(fig, width="stretch")
     st.markdown("</div>", unsafe_allow_html=True)
+
+# -------------------- Compare Periods --------------------
+elif st.session_state["page"] == "Compare Periods":
+    st.markdown("<div class='section'>", unsafe_allow_html=True)
+    st.title("Compare Periods")
+    import rollups
+
+    granularity = st.radio("Period", list(rollups.GRANULARITIES), horizontal=True, key="cmp_granularity")
+    rollup_dir = USER_DIR / rollups.ROLLUP_DIR.name
+    periods = rollups.list_periods(granularity, rollup_dir)
+
+    if len(periods) < 2:
+        st.info("Need at least two stored periods — rollups build up as the ETL runs over time.")
+    else:
+        c1, c2 = st.columns(2)
+        base = c1.selectbox("Compare", periods, index=len(periods) - 2, key="cmp_base")
+        other = c2.selectbox("With", periods, index=len(periods) - 1, key="cmp_other")
+        result = rollups.compare(granularity, base, other, rollup_dir)
+
+        cols = st.columns(len(result["totals"]))
+        for col, row in zip(cols, result["totals"].itertuples()):
+            col.metric(row.metric.replace("_", " ").title(), f"{row.other:,.0f}", f"{row.delta:+,.0f}")
+
+        st.plotly_chart(
+            neon_bar_chart(result["hours"], "hour", "delta", f"Plays by Hour: {other} vs {base}"),
+            width="stretch",
+        )
+
+        c1, c2 = st.columns(2)
+        c1.subheader("Artists")
+        c1.dataframe(result["artists"].head(25), hide_index=True, width="stretch")
+        c2.subheader("Genres")
+        c2.dataframe(result["genres"].head(25), hide_index=True, width="stretch")
+
+        st.subheader("Tracks")
+        st.dataframe(result["tracks"].head(50), hide_index=True, width="stretch")
+
+        st.subheader(f"All {granularity}s")
+        fig = neon_line_chart(rollups.period_totals(granularity, periods, rollup_dir), "period", "plays", "Plays per Period")
+        st.plotly_chart(fig, width="stretch")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# -------------------- Artist Graph --------------------
+elif st.session_state["page"] == "Artist Graph":
+    st.markdown("<div class='section'>", unsafe_allow_html=True)
+    st.title("Artist Graph")
+
+    path = USER_DIR / "artist_neighbors.csv"
+    if not path.exists():
+        st.info("Artist graph not built yet — run `python src/analysis.py`.")
+    else:
+        import pandas as pd
+
+        key = (USER, "artist_neighbors", path.stat().st_mtime_ns)
+        neighbors = shared_cache().get(key, lambda: pd.read_csv(path))
+
+        names = sorted(neighbors["artist"].dropna().unique())
+        choice = st.selectbox("Artist", names, key="graph_artist")
+        picked = neighbors[neighbors["artist"] == choice]
+
+        c1, c2 = st.columns(2)
+        for col, relation, title in [
+            (c1, "co_credit", "Collaborators (shared tracks)"),
+            (c2, "co_listen", "Listened Alongside (shared sessions)"),
+        ]:
+            edges = picked[picked["relation"] == relation]
+            col.subheader(title)
+            if edges.empty:
+                col.info("No connections yet.")
+            else:
+                col.plotly_chart(neon_bar_chart(edges, "neighbor", "weight", title), width="stretch")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# ----------------------------------------
+# Shared Cache Metrics
+# ----------------------------------------
+with st.sidebar:
+    st.caption(f"User: {USER}")
+    st.caption("Shared data cache")
+    st.json(shared_cache().stats())
+    if st.session_state.get("first_paint_ms") is not None:
+        st.caption(f"First paint in {st.session_state['first_paint_ms']:.0f} ms")
@@ -0,0 +1,39 @@
+import os
+import re
+import sys
+from pathlib import Path
+
+# Every user directory is laid out like the repo root:
+#   data/users/<name>/.env, data/users/<name>/data/raw, data/users/<name>/data/curated
+USERS_DIR = Path("data/users")
+
+
+# -------------------------------
+# Helper: user name from `--user <name>` ("default" without it)
+# -------------------------------
+def user_arg(argv=None):
+    argv = sys.argv if argv is None else argv
+    if "--user" not in argv:
+        return "default"
+
+    i = argv.index("--user")
+    name = argv[i + 1] if i + 1 < len(argv) else ""
+    if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", name):
+        sys.exit(f"❌ Invalid user name: {name!r}")
+    return name
+
+
+# -------------------------------
+# Run the rest of a script inside the user's directory
+#   every data/... path then resolves to that user's copy
+# -------------------------------
+def enter_user_dir(argv=None):
+    name = user_arg(argv)
+    if name == "default":
+        return name
+
+    path = USERS_DIR / name
+    path.mkdir(parents=True, exist_ok=True)
+    os.chdir(path)
+    print(f"▶ User: {name} ({path})")
+    return name